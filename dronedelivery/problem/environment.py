@@ -1,5 +1,8 @@
 from itertools import product
 import math
+
+import numpy as np
+
 from dronedelivery.solvers.drone_schedule_configuration import Deliver, Load, Unload
 from dronedelivery.problem.objects.grid import Location
 
@@ -97,6 +100,20 @@ class Environment:
             )
         )
 
+    def get_distance_matrix(self, locations_1, locations_2):
+        """
+        Distances between all pairs of locations, entry [i, j] equals
+        get_distance(locations_1[i], locations_2[j]). The distances are whole numbers,
+        so float32 holds them exactly
+        """
+        xy_1 = np.array([(location.x, location.y) for location in locations_1])
+        xy_2 = np.array([(location.x, location.y) for location in locations_2])
+        return np.ceil(
+            np.hypot(
+                xy_1[:, None, 0] - xy_2[None, :, 0], xy_1[:, None, 1] - xy_2[None, :, 1]
+            )
+        ).astype(np.float32)
+
     def remove_product_from_warehouse(self, warehouse, product):
         self._warehouse_inventory[warehouse].remove(product)
 
@@ -0,0 +1,94 @@
+"""
+Compiled loops emitting the (row, column, coefficient) triplets of the product path
+constraints. Rows and variable indices come in integer arrays indexed by customer
+(c), hub (h) and product (p) positions, with -1 for rows or variables that do not
+exist.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def fill_demand_constraints(demand_rows, product_move_indices):
+    n_customers, n_hubs, n_products = product_move_indices.shape
+    rows = np.empty(n_customers * n_hubs * n_products, dtype=np.int32)
+    cols = np.empty(n_customers * n_hubs * n_products, dtype=np.int32)
+    data = np.empty(n_customers * n_hubs * n_products, dtype=np.float32)
+    k = 0
+    for c in range(n_customers):
+        for p in range(n_products):
+            row = demand_rows[c, p]
+            if row < 0:
+                continue
+            for h in range(n_hubs):
+                col = product_move_indices[c, h, p]
+                if col >= 0:
+                    rows[k] = row
+                    cols[k] = col
+                    data[k] = 1.0
+                    k += 1
+    return rows[:k], cols[:k], data[:k]
+
+
+@njit(cache=True)
+def fill_supply_constraints(supply_rows, product_move_indices, hub_to_hub_indices):
+    n_customers, n_hubs, n_products = product_move_indices.shape
+    max_nonzeros = n_hubs * n_products * (n_customers + 2 * n_hubs)
+    rows = np.empty(max_nonzeros, dtype=np.int32)
+    cols = np.empty(max_nonzeros, dtype=np.int32)
+    data = np.empty(max_nonzeros, dtype=np.float32)
+    k = 0
+    for h in range(n_hubs):
+        for p in range(n_products):
+            row = supply_rows[h, p]
+            for c in range(n_customers):
+                col = product_move_indices[c, h, p]
+                if col >= 0:
+                    rows[k] = row
+                    cols[k] = col
+                    data[k] = 1.0
+                    k += 1
+            for h_ in range(n_hubs):
+                if h_ == h:
+                    continue
+                rows[k] = row
+                cols[k] = hub_to_hub_indices[h_, h, p]
+                data[k] = -1.0
+                k += 1
+                rows[k] = row
+                cols[k] = hub_to_hub_indices[h, h_, p]
+                data[k] = 1.0
+                k += 1
+    return rows[:k], cols[:k], data[:k]
+
+
+@njit(cache=True)
+def fill_trips_constraints(
+    trips_rows, product_move_indices, flights_indices, max_flight_capacity
+):
+    """
+    Also used for hub to hub trips, with the origin hub in place of the customer
+    """
+    n_origins, n_hubs, n_products = product_move_indices.shape
+    rows = np.empty(n_origins * n_hubs * (n_products + 1), dtype=np.int32)
+    cols = np.empty(n_origins * n_hubs * (n_products + 1), dtype=np.int32)
+    data = np.empty(n_origins * n_hubs * (n_products + 1), dtype=np.float32)
+    k = 0
+    for o in range(n_origins):
+        for h in range(n_hubs):
+            row = trips_rows[o, h]
+            if row < 0:
+                continue
+            for p in range(n_products):
+                col = product_move_indices[o, h, p]
+                if col >= 0:
+                    rows[k] = row
+                    cols[k] = col
+                    data[k] = 1.0
+                    k += 1
+            rows[k] = row
+            cols[k] = flights_indices[o, h]
+            data[k] = -max_flight_capacity
+            k += 1
+    return rows[:k], cols[:k], data[:k]
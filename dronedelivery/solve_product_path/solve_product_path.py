@@ -1,13 +1,20 @@
 import itertools
 from dataclasses import dataclass
 
+import numpy as np
+
 from dronedelivery.utils.mip_utils.variables import IntegerVariable
-from dronedelivery.utils.mip_utils.linear_expression import LinearExpression
-from dronedelivery.utils.mip_utils.constraints import (
-    EqualityConstraint,
-    LE_InequalityConstraint,
+from dronedelivery.utils.mip_utils.constraint_matrix import (
+    ConstraintMatrixBuilder,
+    EQUAL,
+    LESS_OR_EQUAL,
 )
 from dronedelivery.utils.mip_utils.model import Model
+from dronedelivery.solve_product_path.constraint_kernels import (
+    fill_demand_constraints,
+    fill_supply_constraints,
+    fill_trips_constraints,
+)
 from dronedelivery.problem.objects import Product
 
 
@@ -23,16 +30,34 @@ class SolveProductTrips:
     def __init__(self, customers, hubs, products, max_flight_capacity, environment):
         self.environment = environment
         self.max_flight_capacity = max_flight_capacity
-
-        decision_variables = self.get_variables(customers, hubs, products)
-        objective = self.get_objective(customers, hubs)
-        constraints = self.get_constraints(customers, hubs, products)
-
-        self.model = Model(
-            decision_variables=decision_variables,
-            objective=objective,
-            constraints=constraints,
-        )
+        self.customers = customers
+        self.hubs = hubs
+        self.products = products
+
+        self.distances = self._get_distances(customers, hubs)
+        # customers x products demand and hubs x products supply, these stay the same
+        # when the model is rebuilt on other arcs
+        self._demand = np.array(
+            [
+                [customer.demand.get(product, 0) for product in products]
+                for customer in customers
+            ],
+            dtype=np.int64,
+        ).reshape(len(customers), len(products))
+        self._supply = np.array(
+            [
+                [hub.get_available_items(product) for product in products]
+                for hub in hubs
+            ],
+            dtype=np.int64,
+        ).reshape(len(hubs), len(products))
+        # ordered pairs of different hubs, by position in hubs
+        self._hub_pairs = [
+            (h1, h2)
+            for h1, h2 in itertools.product(range(len(hubs)), repeat=2)
+            if h1 != h2
+        ]
+        self.model = self.get_model(customers, hubs, products)
 
     def solve(self, Mip_Solver, max_seconds=120):
         mip_solver = Mip_Solver(model=self.model)
@@ -40,219 +65,310 @@ class SolveProductTrips:
         trips = self._get_trips(solution)
         return trips
 
+    def solve_cg(self, Mip_Solver, max_iters=10, n_nearest_hubs=1, max_seconds=120):
+        """
+        Column generation over the customer-hub arcs. The LP relaxation is solved on
+        a restricted set of arcs, starting from the nearest hubs of every customer
+        (hub to hub arcs are always available). Arcs with a negative reduced cost,
+        priced at distance / max_flight_capacity per product with the duals of the
+        demand and supply constraints, are added until there are none left or
+        max_iters is reached. The MIP is then solved on the final set of arcs.
+
+        Mip_Solver needs a solve_relaxation method returning the constraint duals.
+        """
+        n_customers = len(self.customers)
+        customer_distances = self.distances[:, :n_customers].T
+        nearest_hubs = np.argsort(customer_distances, axis=1)[:, :n_nearest_hubs]
+        customer_hubs = np.zeros(customer_distances.shape, dtype=bool)
+        np.put_along_axis(customer_hubs, nearest_hubs, True, axis=1)
+
+        demanded = self._demand > 0
+        unit_costs = customer_distances / self.max_flight_capacity
+
+        for _ in range(max_iters):
+            model = self.get_model(
+                self.customers, self.hubs, self.products, customer_hubs
+            )
+            duals = Mip_Solver(model=model).solve_relaxation()
+            demand_duals = np.where(self._demand_rows >= 0, duals[self._demand_rows], 0)
+            supply_duals = duals[self._supply_rows]
+
+            # [c, h, p]
+            reduced_costs = (
+                unit_costs[:, :, None]
+                - demand_duals[:, None, :]
+                - supply_duals[None, :, :]
+            )
+            new_customer_hubs = ~customer_hubs & np.any(
+                (reduced_costs < -1e-9) & demanded[:, None, :], axis=2
+            )
+            if not new_customer_hubs.any():
+                break
+            customer_hubs |= new_customer_hubs
+
+        self.model = self.get_model(
+            self.customers, self.hubs, self.products, customer_hubs
+        )
+        return self.solve(Mip_Solver, max_seconds=max_seconds)
+
+    def get_model(self, customers, hubs, products, customer_hubs=None):
+        """
+        customer_hubs is an optional boolean customers x hubs array with the arcs
+        between customers and hubs to include, all arcs by default
+        """
+        if customer_hubs is None:
+            customer_hubs = np.ones((len(customers), len(hubs)), dtype=bool)
+
+        decision_variables = self.get_variables(
+            customers, hubs, products, customer_hubs
+        )
+        objective = self.get_objective(customers, hubs)
+        constraint_matrix, sense, rhs = self.get_constraints(customers, hubs, products)
+
+        return Model.from_sparse(
+            decision_variables=decision_variables,
+            objective=objective,
+            constraint_matrix=constraint_matrix,
+            sense=sense,
+            rhs=rhs,
+        )
+
     def _get_trips(self, solution):
-        trips_hub_to_customer = []
-        trips_hub_to_hub = []
+        moves = {ProductsMoveCustomerHub: [], ProductsMoveHubHub: []}
         for variable, value in solution.items():
-            if value != 0 and isinstance(variable, ProductsMoveCustomerHub):
-                trips_hub_to_customer.append(
-                    Trip(
-                        origin=variable.data["hub"],
-                        destination=variable.data["customer"],
-                        product_type=variable.data["product"],
-                        product_quantity=value,
-                    )
-                )
-            if value != 0 and isinstance(variable, ProductsMoveHubHub):
-                trips_hub_to_hub.append(
-                    Trip(
-                        origin=variable.data["hub1"],
-                        destination=variable.data["hub2"],
-                        product_type=variable.data["product"],
-                        product_quantity=value,
-                    )
-                )
+            variable_moves = moves.get(type(variable))
+            if variable_moves is not None and value != 0:
+                variable_moves.append((variable.data, value))
 
         return {
-            "hub_to_customer": trips_hub_to_customer,
-            "hub_to_hub": trips_hub_to_hub,
+            "hub_to_customer": [
+                Trip(
+                    origin=data["hub"],
+                    destination=data["customer"],
+                    product_type=data["product"],
+                    product_quantity=value,
+                )
+                for data, value in moves[ProductsMoveCustomerHub]
+            ],
+            "hub_to_hub": [
+                Trip(
+                    origin=data["hub1"],
+                    destination=data["hub2"],
+                    product_type=data["product"],
+                    product_quantity=value,
+                )
+                for data, value in moves[ProductsMoveHubHub]
+            ],
         }
 
-    def get_variables(self, customers, hubs, products):
-        self.n_flights_variables = self._get_n_flights_variables(customers, hubs)
-        self.n_product_move_variables = self._get_n_products_move_variables(
-            customers, hubs, products
-        )
-        self.n_flights_hub_to_hub_variables = self._get_n_flights_hub_to_hub(hubs)
-        self.n_products_move_hub_to_hub_variables = (
-            self._get_n_products_move_hub_to_hub(hubs, products)
+    def get_variables(self, customers, hubs, products, customer_hubs):
+        """
+        Variables are stored in object arrays indexed by the position of the
+        customer, hub and product in their lists, e.g.
+        n_product_move_variables[c, h, p]. Hub to hub arrays are None on the diagonal,
+        product moves are None for products the customer does not demand and
+        customer variables are None for arcs not in customer_hubs.
+        """
+        n_customers, n_hubs, n_products = len(customers), len(hubs), len(products)
+        self.n_flights_variables = np.empty((n_customers, n_hubs), dtype=object)
+        self.n_product_move_variables = np.empty(
+            (n_customers, n_hubs, n_products), dtype=object
         )
-        return (
-            list(self.n_flights_variables.values())
-            + list(self.n_product_move_variables.values())
-            + list(self.n_flights_hub_to_hub_variables.values())
-            + list(self.n_products_move_hub_to_hub_variables.values())
+        self.n_flights_hub_to_hub_variables = np.empty((n_hubs, n_hubs), dtype=object)
+        self.n_products_move_hub_to_hub_variables = np.empty(
+            (n_hubs, n_hubs, n_products), dtype=object
         )
+        self.decision_variables = []
+
+        hub_destinations = {h: [] for h in range(n_hubs)}
+        for h1, h2 in self._hub_pairs:
+            hub_destinations[h1].append(h2)
+
+        # a single pass over all arcs leaving each hub
+        for h, hub in enumerate(hubs):
+            for c, customer in enumerate(customers):
+                if not customer_hubs[c, h]:
+                    continue
+                self.n_flights_variables[c, h] = self._add_variable(
+                    FlightsCustomerHub,
+                    lower_bound=0,
+                    data={"customer": customer, "hub": hub},
+                )
+                for p, product in enumerate(products):
+                    if product in customer.demand:
+                        self.n_product_move_variables[c, h, p] = self._add_variable(
+                            ProductsMoveCustomerHub,
+                            lower_bound=0,
+                            upper_bound=customer.demand[product],
+                            data={"customer": customer, "hub": hub, "product": product},
+                        )
+
+            for h2 in hub_destinations[h]:
+                hub2 = hubs[h2]
+                self.n_flights_hub_to_hub_variables[h, h2] = self._add_variable(
+                    FlightsHubHub, lower_bound=0, data={"hub1": hub, "hub2": hub2}
+                )
+                for p, product in enumerate(products):
+                    variable = self._add_variable(
+                        ProductsMoveHubHub,
+                        lower_bound=0,
+                        data={"hub1": hub, "hub2": hub2, "product": product},
+                    )
+                    self.n_products_move_hub_to_hub_variables[h, h2, p] = variable
+
+        return self.decision_variables
+
+    def _add_variable(self, Variable, **kwargs):
+        variable = Variable(index=len(self.decision_variables), **kwargs)
+        self.decision_variables.append(variable)
+        return variable
 
     def get_objective(self, customers, hubs):
-        le = LinearExpression()
-        for customer, hub in itertools.product(customers, hubs):
-            le.add_variable(
-                variable=self.n_flights_variables[customer, hub],
-                coefficient=self.environment.get_distance(hub.location, customer.location),
-            )
+        distances = self.distances
+        n_customers, n_hubs = len(customers), len(hubs)
 
-        for hub1, hub2 in itertools.product(hubs, hubs):
-            if hub1 != hub2:
-                le.add_variable(
-                    variable=self.n_flights_hub_to_hub_variables[hub1, hub2],
-                    coefficient=self.environment.get_distance(hub1.location, hub2.location),
-                )
-        return le
+        objective = np.zeros(len(self.decision_variables), dtype=np.float32)
+        for c, h in itertools.product(range(n_customers), range(n_hubs)):
+            variable = self.n_flights_variables[c, h]
+            if variable is not None:
+                objective[variable.index] = distances[h, c]
+
+        for h1, h2 in self._hub_pairs:
+            variable = self.n_flights_hub_to_hub_variables[h1, h2]
+            objective[variable.index] = distances[h1, n_customers + h2]
+        return objective
 
     def get_constraints(self, customers, hubs, products):
-        demand_constraints = self._get_demand_constraints(customers, products, hubs)
-        supply_constraints = self._get_supply_constraints(customers, products, hubs)
-        trips_constraints = self._get_trips_constraints(customers, products, hubs)
-        trips_hub_hub_constraints = self._get_trips_hub_to_hub_constraints(
-            products, hubs
-        )
-        return (
-            demand_constraints
-            + supply_constraints
-            + trips_constraints
-            + trips_hub_hub_constraints
+        n_customers, n_hubs, n_products = len(customers), len(hubs), len(products)
+        # upper bound on the number of nonzeros over all constraint types below
+        max_nonzeros = (
+            n_customers * n_products * n_hubs
+            + n_hubs * n_products * (n_customers + 2 * n_hubs)
+            + n_customers * n_hubs * (n_products + 1)
+            + n_hubs * n_hubs * (n_products + 1)
         )
+        constraints = ConstraintMatrixBuilder(max_nonzeros=max_nonzeros)
 
-    def _get_n_flights_variables(self, customers, hubs):
-        return {
-            (customer, hub): FlightsCustomerHub(
-                name={f"number of flights from {hub} to {customer}"},
-                lower_bound=0,
-                data={"customer": customer, "hub": hub},
-            )
-            for customer, hub in itertools.product(customers, hubs)
-        }
-
-    def _get_n_products_move_variables(self, customers, hubs, products):
-        return {
-            (customer, hub, product): ProductsMoveCustomerHub(
-                name={
-                    f"number of products of product type {product} from {hub} to {customer}"
-                },
-                lower_bound=0,
-                upper_bound=customer.demand[product]
-                if product in customer.demand
-                else 0,
-                data={"customer": customer, "hub": hub, "product": product},
-            )
-            for customer, hub, product in itertools.product(customers, hubs, products)
-        }
+        self._product_move_indices = _get_indices(self.n_product_move_variables)
+        self._hub_to_hub_indices = _get_indices(
+            self.n_products_move_hub_to_hub_variables
+        )
 
-    def _get_n_flights_hub_to_hub(self, hubs):
-        return {
-            (hub1, hub2): FlightsHubHub(
-                name={f"number of flights from {hub1} to {hub2}"},
-                lower_bound=0,
-                data={"hub1": hub1, "hub2": hub2},
-            )
-            for hub1, hub2 in itertools.product(hubs, hubs)
-            if hub1 != hub2
-        }
+        self._get_demand_constraints(constraints, customers, products, hubs)
+        self._get_supply_constraints(constraints, customers, products, hubs)
+        self._get_trips_constraints(constraints, customers, products, hubs)
+        self._get_trips_hub_to_hub_constraints(constraints, products, hubs)
 
-    def _get_n_products_move_hub_to_hub(self, hubs, products):
-        return {
-            (hub1, hub2, product): ProductsMoveHubHub(
-                name={
-                    f"number of products of product type {product} from {hub1} to {hub2}"
-                },
-                lower_bound=0,
-                data={"hub1": hub1, "hub2": hub2, "product": product},
-            )
-            for hub1, hub2, product in itertools.product(hubs, hubs, products)
-            if hub1 != hub2
-        }
+        return (
+            constraints.get_matrix(n_variables=len(self.decision_variables)),
+            constraints.get_sense(),
+            constraints.get_rhs(),
+        )
 
-    def _get_demand_constraints(self, customers, products, hubs):
-        constraints = []
-        for customer, product in itertools.product(customers, products):
-            if product in customer.demand:
-                lhs = LinearExpression()
-                for hub in hubs:
-                    lhs.add_variable(
-                        self.n_product_move_variables[(customer, hub, product)]
-                    )
-                constraints.append(
-                    EqualityConstraint(lhs=lhs, rhs=customer.demand[product])
-                )
-        return constraints
-
-    def _get_supply_constraints(self, customers, products, hubs):
-        constraints = []
-        for hub, product in itertools.product(hubs, products):
-            le_1 = LinearExpression()
-            for customer in customers:
-                le_1.add_variable(
-                    self.n_product_move_variables[(customer, hub, product)]
-                )
+    def _get_distances(self, customers, hubs):
+        """
+        hubs x (customers + hubs) distance matrix
+        """
+        hub_locations = [hub.location for hub in hubs]
+        customer_locations = [customer.location for customer in customers]
+        return self.environment.get_distance_matrix(
+            hub_locations, customer_locations + hub_locations
+        )
 
-            le_2 = LinearExpression()
-            for hub_ in hubs:
-                if hub_ != hub:
-                    le_2.add_variable(
-                        self.n_products_move_hub_to_hub_variables[(hub_, hub, product)],
-                        1,
-                    )
-                    le_2.add_variable(
-                        self.n_products_move_hub_to_hub_variables[(hub, hub_, product)],
-                        -1,
-                    )
+    def _get_demand_constraints(self, constraints, customers, products, hubs):
+        demanded = self._demand > 0
+        self._demand_rows = np.full(demanded.shape, -1, dtype=np.int32)
+        self._demand_rows[demanded] = constraints.add_constraints(
+            EQUAL, self._demand[demanded].tolist()
+        )
+        constraints.add_coefficients(
+            *fill_demand_constraints(self._demand_rows, self._product_move_indices)
+        )
 
-            constraints.append(
-                LE_InequalityConstraint(
-                    lhs=le_1 - le_2, rhs=hub.get_available_items(product)
-                )
+    def _get_supply_constraints(self, constraints, customers, products, hubs):
+        self._supply_rows = constraints.add_constraints(
+            LESS_OR_EQUAL, self._supply.ravel().tolist()
+        ).reshape(self._supply.shape)
+        constraints.add_coefficients(
+            *fill_supply_constraints(
+                self._supply_rows,
+                self._product_move_indices,
+                self._hub_to_hub_indices,
             )
-        return constraints
-
-    def _get_trips_constraints(self, customers, products, hubs):
-        constraints = []
-        for customer, hub in itertools.product(customers, hubs):
-            le_1 = LinearExpression()
-            for product in products:
-                le_1.add_variable(
-                    self.n_product_move_variables[(customer, hub, product)]
-                )
+        )
 
-            le_2 = LinearExpression()
-            le_2.add_variable(
-                self.n_flights_variables[(customer, hub)], self.max_flight_capacity
+    def _get_trips_constraints(self, constraints, customers, products, hubs):
+        flights_indices = _get_indices(self.n_flights_variables)
+        trips_rows = np.full(flights_indices.shape, -1, dtype=np.int32)
+        has_flights = flights_indices >= 0
+        trips_rows[has_flights] = constraints.add_constraints(
+            LESS_OR_EQUAL, [0] * np.count_nonzero(has_flights)
+        )
+        constraints.add_coefficients(
+            *fill_trips_constraints(
+                trips_rows,
+                self._product_move_indices,
+                flights_indices,
+                self.max_flight_capacity,
             )
+        )
 
-            constraints.append(LE_InequalityConstraint(lhs=le_1 - le_2, rhs=0))
-        return constraints
-
-    def _get_trips_hub_to_hub_constraints(self, products, hubs):
-        constraints = []
-        for hub1, hub2 in itertools.product(hubs, hubs):
-            if hub1 != hub2:
-                le_1 = LinearExpression()
-                for product in products:
-                    le_1.add_variable(
-                        self.n_products_move_hub_to_hub_variables[(hub1, hub2, product)]
-                    )
+    def _get_trips_hub_to_hub_constraints(self, constraints, products, hubs):
+        flights_indices = _get_indices(self.n_flights_hub_to_hub_variables)
+        trips_rows = np.full(flights_indices.shape, -1, dtype=np.int32)
+        has_flights = flights_indices >= 0
+        trips_rows[has_flights] = constraints.add_constraints(
+            LESS_OR_EQUAL, [0] * np.count_nonzero(has_flights)
+        )
+        constraints.add_coefficients(
+            *fill_trips_constraints(
+                trips_rows,
+                self._hub_to_hub_indices,
+                flights_indices,
+                self.max_flight_capacity,
+            )
+        )
 
-                le_2 = LinearExpression()
-                le_2.add_variable(
-                    self.n_flights_hub_to_hub_variables[(hub1, hub2)],
-                    self.max_flight_capacity,
-                )
 
-                constraints.append(LE_InequalityConstraint(lhs=le_1 - le_2, rhs=0))
-        return constraints
+def _get_indices(variables):
+    """
+    Array with the index of each variable, -1 where there is no variable
+    """
+    return np.array(
+        [-1 if variable is None else variable.index for variable in variables.flat],
+        dtype=np.int32,
+    ).reshape(variables.shape)
 
 
 class FlightsCustomerHub(IntegerVariable):
-    pass
+    __slots__ = ()
+
+    def _get_name(self):
+        return f"number of flights from {self.data['hub']} to {self.data['customer']}"
 
 
 class ProductsMoveCustomerHub(IntegerVariable):
-    pass
+    __slots__ = ()
+
+    def _get_name(self):
+        return (
+            f"number of products of product type {self.data['product']} "
+            f"from {self.data['hub']} to {self.data['customer']}"
+        )
 
 
 class FlightsHubHub(IntegerVariable):
-    pass
+    __slots__ = ()
+
+    def _get_name(self):
+        return f"number of flights from {self.data['hub1']} to {self.data['hub2']}"
 
 
 class ProductsMoveHubHub(IntegerVariable):
-    pass
+    __slots__ = ()
+
+    def _get_name(self):
+        return (
+            f"number of products of product type {self.data['product']} "
+            f"from {self.data['hub1']} to {self.data['hub2']}"
+        )
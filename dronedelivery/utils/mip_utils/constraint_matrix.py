@@ -0,0 +1,69 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+EQUAL = "="
+LESS_OR_EQUAL = "<"
+
+
+class ConstraintMatrixBuilder:
+    """
+    Collects linear constraints as (row, column, coefficient) triplets, where the
+    column is the index of the decision variable.
+    """
+
+    def __init__(self, max_nonzeros):
+        self.rows = np.empty(max_nonzeros, dtype=np.int32)
+        self.cols = np.empty(max_nonzeros, dtype=np.int32)
+        self.data = np.empty(max_nonzeros, dtype=np.float32)
+        self.n_nonzeros = 0
+
+        self.sense = []
+        self.rhs = []
+
+    def add_constraint(self, sense, rhs):
+        self.sense.append(sense)
+        self.rhs.append(rhs)
+        return len(self.rhs) - 1
+
+    def add_constraints(self, sense, rhs):
+        """
+        Adds a row with the given sense for each value in rhs and returns their rows
+        """
+        first_row = len(self.rhs)
+        self.sense.extend([sense] * len(rhs))
+        self.rhs.extend(rhs)
+        return np.arange(first_row, len(self.rhs), dtype=np.int32)
+
+    def add_coefficients(self, rows, cols, coefficients=1):
+        """
+        Adds the coefficients for broadcastable arrays of rows and variable indices,
+        entries with a negative variable index are skipped
+        """
+        rows, cols, coefficients = np.broadcast_arrays(rows, cols, coefficients)
+        present = cols >= 0
+        k = self.n_nonzeros
+        n = np.count_nonzero(present)
+        self.rows[k : k + n] = rows[present]
+        self.cols[k : k + n] = cols[present]
+        self.data[k : k + n] = coefficients[present]
+        self.n_nonzeros = k + n
+
+    def add_coefficient(self, row, variable, coefficient=1):
+        k = self.n_nonzeros
+        self.rows[k] = row
+        self.cols[k] = variable.index
+        self.data[k] = coefficient
+        self.n_nonzeros = k + 1
+
+    def get_matrix(self, n_variables):
+        k = self.n_nonzeros
+        return csr_matrix(
+            (self.data[:k], (self.rows[:k], self.cols[:k])),
+            shape=(len(self.rhs), n_variables),
+        )
+
+    def get_sense(self):
+        return np.array(self.sense)
+
+    def get_rhs(self):
+        return np.array(self.rhs, dtype=np.float64)
@@ -0,0 +1,91 @@
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .constraint_matrix import EQUAL
+
+
+class CpSatSolver:
+    """
+    Solves a sparse Model with the OR-Tools CP-SAT solver. CP-SAT only takes integer
+    coefficients and bounded variables, variables without an upper bound are
+    bounded by the sum of the absolute right hand sides.
+    """
+
+    def __init__(self, model, num_workers=8):
+        assert model.is_sparse()
+        self.m = cp_model.CpModel()
+        self.num_workers = num_workers
+
+        default_upper_bound = max(int(np.abs(model.constraint_rhs).sum()), 1)
+        self.model_variables = self._add_variables_to_model(
+            model.decision_variables, default_upper_bound
+        )
+        self.columns = [None] * len(self.model_variables)
+        for decision_variable, model_variable in self.model_variables.items():
+            self.columns[decision_variable.index] = model_variable
+
+        self._add_constraint_matrix_to_model(
+            model.constraint_matrix, model.constraint_sense, model.constraint_rhs
+        )
+        self._add_objective_to_model(model.objective)
+
+    def _add_variables_to_model(self, decision_variables, default_upper_bound):
+        return {
+            decision_variable: self.m.NewIntVar(
+                (
+                    0
+                    if decision_variable.lower_bound is None
+                    else decision_variable.lower_bound
+                ),
+                (
+                    default_upper_bound
+                    if decision_variable.upper_bound is None
+                    else decision_variable.upper_bound
+                ),
+                decision_variable.name,
+            )
+            for decision_variable in decision_variables
+        }
+
+    def _add_constraint_matrix_to_model(self, constraint_matrix, sense, rhs):
+        indptr = constraint_matrix.indptr.tolist()
+        indices = constraint_matrix.indices.tolist()
+        data = _to_integers(constraint_matrix.data).tolist()
+        for row, (row_sense, row_rhs) in enumerate(
+            zip(sense, _to_integers(rhs).tolist())
+        ):
+            start, end = indptr[row], indptr[row + 1]
+            lhs = cp_model.LinearExpr.WeightedSum(
+                [self.columns[col] for col in indices[start:end]], data[start:end]
+            )
+            if row_sense == EQUAL:
+                self.m.Add(lhs == row_rhs)
+            else:
+                self.m.Add(lhs <= row_rhs)
+
+    def _add_objective_to_model(self, objective):
+        nonzero = np.flatnonzero(objective)
+        self.m.Minimize(
+            cp_model.LinearExpr.WeightedSum(
+                [self.columns[col] for col in nonzero.tolist()],
+                _to_integers(objective[nonzero]).tolist(),
+            )
+        )
+
+    def solve(self, max_seconds=None):
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = self.num_workers
+        if max_seconds is not None:
+            solver.parameters.max_time_in_seconds = max_seconds
+        self.status = solver.Solve(self.m)
+        return {
+            name: int(solver.Value(model_variable))
+            for name, model_variable in self.model_variables.items()
+        }
+
+
+def _to_integers(values):
+    integers = np.round(values).astype(np.int64)
+    if not np.array_equal(integers, values):
+        raise ValueError("CP-SAT only takes integer coefficients")
+    return integers
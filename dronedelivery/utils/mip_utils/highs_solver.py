@@ -0,0 +1,103 @@
+import highspy
+import numpy as np
+
+from .constraint_matrix import EQUAL
+
+
+class HighsSolver:
+    """
+    Solves a sparse Model by handing the objective vector and constraint matrix to
+    HiGHS directly, without building an expression per constraint.
+    """
+
+    def __init__(self, model):
+        assert model.is_sparse()
+        self.h = highspy.Highs()
+        self.decision_variables = self._get_columns(model.decision_variables)
+
+        self._add_variables_to_model(self.decision_variables, model.objective)
+        self._add_constraint_matrix_to_model(
+            model.constraint_matrix, model.constraint_sense, model.constraint_rhs
+        )
+
+    def _add_variables_to_model(self, decision_variables, objective):
+        n_variables = len(decision_variables)
+        lower = np.array(
+            [
+                (
+                    -highspy.kHighsInf
+                    if variable.lower_bound is None
+                    else variable.lower_bound
+                )
+                for variable in decision_variables
+            ],
+            dtype=np.float64,
+        )
+        upper = np.array(
+            [
+                (
+                    highspy.kHighsInf
+                    if variable.upper_bound is None
+                    else variable.upper_bound
+                )
+                for variable in decision_variables
+            ],
+            dtype=np.float64,
+        )
+        no_entries = np.array([], dtype=np.int32)
+        self.h.addCols(
+            n_variables,
+            np.asarray(objective, dtype=np.float64),
+            lower,
+            upper,
+            0,
+            no_entries,
+            no_entries,
+            np.array([], dtype=np.float64),
+        )
+        self.h.changeColsIntegrality(
+            n_variables,
+            np.arange(n_variables, dtype=np.int32),
+            np.full(n_variables, highspy.HighsVarType.kInteger, dtype=np.uint8),
+        )
+
+    def _add_constraint_matrix_to_model(self, constraint_matrix, sense, rhs):
+        rhs = np.asarray(rhs, dtype=np.float64)
+        lower = np.where(sense == EQUAL, rhs, -highspy.kHighsInf)
+        self.h.addRows(
+            len(rhs),
+            lower,
+            rhs,
+            constraint_matrix.nnz,
+            constraint_matrix.indptr[:-1].astype(np.int32),
+            constraint_matrix.indices.astype(np.int32),
+            constraint_matrix.data.astype(np.float64),
+        )
+
+    @staticmethod
+    def _get_columns(decision_variables):
+        columns = [None] * len(decision_variables)
+        for decision_variable in decision_variables:
+            columns[decision_variable.index] = decision_variable
+        return columns
+
+    def solve_relaxation(self):
+        """
+        Solves the LP relaxation and returns the dual value of every constraint, the
+        variables stay continuous afterwards
+        """
+        n_variables = len(self.decision_variables)
+        self.h.changeColsIntegrality(
+            n_variables,
+            np.arange(n_variables, dtype=np.int32),
+            np.full(n_variables, highspy.HighsVarType.kContinuous, dtype=np.uint8),
+        )
+        self.status = self.h.run()
+        return np.array(self.h.getSolution().row_dual)
+
+    def solve(self, max_seconds=None):
+        if max_seconds is not None:
+            self.h.setOptionValue("time_limit", float(max_seconds))
+        self.status = self.h.run()
+        values = np.round(self.h.getSolution().col_value).astype(int).tolist()
+        return dict(zip(self.decision_variables, values))
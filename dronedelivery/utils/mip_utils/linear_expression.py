@@ -19,9 +19,9 @@ class LinearExpression:
         self.constant += constant
 
     def __copy__(self):
+        # coefficients are never zero, so they can be taken over as they are
         le = LinearExpression()
-        for variable, coefficient in self.variables.items():
-            le.add_variable(variable, coefficient)
+        le.variables.update(self.variables)
         le.add_constant(self.constant)
         return le
 
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 from mip import Model, MINIMIZE, CBC, xsum, minimize, INTEGER
 
@@ -8,10 +11,35 @@ from .variables import IntegerVariable
 class MipSolver:
     def __init__(self, model):
         self.m = Model(sense=MINIMIZE, solver_name=CBC)
-        self.model_variables = self._add_variables_to_model(model.decision_variables)
 
-        self._add_constraints_to_model(model.constraints)
-        self._add_objective_to_model(model.objective)
+        if model.is_sparse():
+            self.model_variables = self._read_sparse_model(model)
+        else:
+            self.model_variables = self._add_variables_to_model(
+                model.decision_variables
+            )
+            self._add_constraints_to_model(model.constraints)
+            self._add_objective_to_model(model.objective)
+
+    def _read_sparse_model(self, model):
+        """
+        CBC reads a sparse model from MPS, so no Python object is created per
+        constraint or term
+        """
+        # reading clears the model, which sets cuts and threads to other values than
+        # a new model has
+        cuts, threads = self.m.cuts, self.m.threads
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.mps")
+            with open(path, "wb") as mps_file:
+                mps_file.write(model.to_mps_bytes())
+            self.m.read(path)
+        self.m.cuts, self.m.threads = cuts, threads
+
+        return {
+            decision_variable: self.m.vars[decision_variable.index]
+            for decision_variable in model.decision_variables
+        }
 
     def _add_objective_to_model(self, objective):
         self.m.objective = minimize(
@@ -52,6 +80,13 @@ class MipSolver:
                 raise Exception(f"Do not recognize this variable {decision_variable}")
         return model_variables
 
+    def solve_relaxation(self):
+        """
+        Solves the LP relaxation and returns the dual value of every constraint
+        """
+        self.status = self.m.optimize(relax=True)
+        return np.array([constr.pi for constr in self.m.constrs])
+
     def solve(self, max_seconds=None):
         self.status = self.m.optimize(max_seconds)
         return {
@@ -1,10 +1,84 @@
 from dataclasses import dataclass
 
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .constraint_matrix import EQUAL, LESS_OR_EQUAL
 from .linear_expression import LinearExpression
 
+MPS_SENSE = {EQUAL: "E", LESS_OR_EQUAL: "L"}
+
 
 @dataclass
 class Model:
     decision_variables: list
     objective: LinearExpression
     constraints: list
+    constraint_matrix: csr_matrix = None
+    constraint_sense: np.ndarray = None
+    constraint_rhs: np.ndarray = None
+
+    @classmethod
+    def from_sparse(cls, decision_variables, objective, constraint_matrix, sense, rhs):
+        """
+        objective is a vector with a coefficient per decision variable index and row i
+        of the constraint matrix reads: constraint_matrix[i] @ x (sense[i]) rhs[i]
+        """
+        return cls(
+            decision_variables=decision_variables,
+            objective=objective,
+            constraints=[],
+            constraint_matrix=constraint_matrix,
+            constraint_sense=sense,
+            constraint_rhs=rhs,
+        )
+
+    def is_sparse(self):
+        return self.constraint_matrix is not None
+
+    def to_mps_bytes(self):
+        """
+        The sparse model in free MPS format, all variables are integer. Column j is
+        named x<j> after the decision variable index and row i is named r<i>.
+        """
+        assert self.is_sparse()
+        objective = np.asarray(self.objective, dtype=np.float64).tolist()
+        columns = self.constraint_matrix.tocsc()
+        indptr = columns.indptr.tolist()
+        indices = columns.indices.tolist()
+        data = columns.data.tolist()
+
+        lines = ["NAME model", "ROWS", " N obj"]
+        lines += [
+            f" {MPS_SENSE[sense]} r{row}"
+            for row, sense in enumerate(self.constraint_sense)
+        ]
+
+        lines += ["COLUMNS", " MARKER 'MARKER' 'INTORG'"]
+        for col, coefficient in enumerate(objective):
+            start, end = indptr[col], indptr[col + 1]
+            if coefficient != 0 or start == end:
+                lines.append(f" x{col} obj {coefficient!r}")
+            lines += [f" x{col} r{indices[k]} {data[k]!r}" for k in range(start, end)]
+        lines.append(" MARKER 'MARKER' 'INTEND'")
+
+        lines.append("RHS")
+        lines += [
+            f" rhs r{row} {rhs!r}"
+            for row, rhs in enumerate(np.asarray(self.constraint_rhs).tolist())
+            if rhs != 0
+        ]
+
+        lines.append("BOUNDS")
+        for variable in self.decision_variables:
+            if variable.lower_bound is None:
+                lines.append(f" MI bnd x{variable.index}")
+            else:
+                lines.append(f" LO bnd x{variable.index} {variable.lower_bound!r}")
+            if variable.upper_bound is None:
+                lines.append(f" PL bnd x{variable.index}")
+            else:
+                lines.append(f" UP bnd x{variable.index} {variable.upper_bound!r}")
+        lines.append("ENDATA")
+
+        return ("\n".join(lines) + "\n").encode()
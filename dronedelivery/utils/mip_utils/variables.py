@@ -1,12 +1,29 @@
-from dataclasses import dataclass
+class IntegerVariable:
+    __slots__ = ("_name", "lower_bound", "upper_bound", "data", "index")
 
+    def __init__(
+        self, name=None, lower_bound=None, upper_bound=None, data=None, index=None
+    ):
+        self._name = name
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.data = data
+        self.index = index
 
-@dataclass(frozen=True)
-class IntegerVariable:
-    name: str
-    lower_bound: int = None
-    upper_bound: int = None
-    data: dict = None
+    @property
+    def name(self):
+        """
+        Without an explicit name, the name is only formatted when asked for
+        """
+        return self._name if self._name is not None else self._get_name()
+
+    def _get_name(self):
+        return f"integer variable {self.index}"
+
+    def __repr__(self):
+        return self.name
 
     def __hash__(self):
-        return id(self)
+        # equality is identity; the index is unique within a model and hashes as
+        # a small int
+        return id(self) if self.index is None else self.index
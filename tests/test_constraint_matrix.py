@@ -0,0 +1,38 @@
+import numpy as np
+
+from dronedelivery.utils.mip_utils.constraint_matrix import (
+    ConstraintMatrixBuilder,
+    EQUAL,
+    LESS_OR_EQUAL,
+)
+from dronedelivery.utils.mip_utils.variables import IntegerVariable
+
+
+def test_constraint_matrix_builder():
+    x = IntegerVariable(name="x", index=0)
+    y = IntegerVariable(name="y", index=1)
+
+    constraints = ConstraintMatrixBuilder(max_nonzeros=4)
+    row = constraints.add_constraint(EQUAL, 3)
+    constraints.add_coefficient(row, x)
+    constraints.add_coefficient(row, y, 2)
+    row = constraints.add_constraint(LESS_OR_EQUAL, 0)
+    constraints.add_coefficient(row, y, -1)
+
+    matrix = constraints.get_matrix(n_variables=2)
+    assert matrix.toarray().tolist() == [[1, 2], [0, -1]]
+    assert matrix.dtype == np.float32
+    assert matrix.indices.dtype == np.int32
+    assert constraints.get_sense().tolist() == [EQUAL, LESS_OR_EQUAL]
+    assert constraints.get_rhs().tolist() == [3, 0]
+
+
+def test_constraint_matrix_builder_add_coefficients():
+    constraints = ConstraintMatrixBuilder(max_nonzeros=4)
+    rows = constraints.add_constraints(LESS_OR_EQUAL, [1, 2])
+    constraints.add_coefficients(rows[:, None], np.array([[0, -1], [2, 1]]))
+    constraints.add_coefficients(rows, np.array([-1, 0]), -1)
+
+    matrix = constraints.get_matrix(n_variables=3)
+    assert matrix.toarray().tolist() == [[1, 0, 0], [-1, 1, 1]]
+    assert constraints.get_rhs().tolist() == [1, 2]
@@ -1,5 +1,7 @@
 from unittest.mock import Mock
 
+import numpy as np
+
 from dronedelivery.problem.objects.grid import Location
 from dronedelivery.problem.objects.warehouse import WareHouse
 from tests.fixtures import full_problem
@@ -40,3 +42,17 @@ def test_get_distance(full_problem):
     place2 = Location(x=15, y=50)
     distance = environment.get_distance(place1, place2)
     assert distance == 12
+
+
+def test_get_distance_matrix(full_problem):
+    environment = full_problem.get_environment()
+
+    locations_1 = [Location(x=10, y=40), Location(x=0, y=0)]
+    locations_2 = [Location(x=15, y=50), Location(x=10, y=40), Location(x=3, y=4)]
+    distances = environment.get_distance_matrix(locations_1, locations_2)
+
+    assert distances.shape == (2, 3)
+    assert distances.dtype == np.float32
+    for i, location_1 in enumerate(locations_1):
+        for j, location_2 in enumerate(locations_2):
+            assert distances[i, j] == environment.get_distance(location_1, location_2)
@@ -0,0 +1,34 @@
+from copy import copy
+
+from dronedelivery.utils.mip_utils.linear_expression import LinearExpression
+from dronedelivery.utils.mip_utils.variables import IntegerVariable
+
+
+def test_linear_expression_subtraction():
+    x = IntegerVariable(name="x", index=0)
+    y = IntegerVariable(name="y", index=1)
+
+    le_1 = LinearExpression()
+    le_1.add_variable(x, 2)
+    le_1.add_variable(y)
+    le_1.add_constant(3)
+
+    le_2 = LinearExpression()
+    le_2.add_variable(y)
+    le_2.add_constant(1)
+
+    le = le_1 - le_2
+    assert dict(le.variables) == {x: 2}
+    assert le.constant == 2
+    assert dict(le_1.variables) == {x: 2, y: 1}
+
+
+def test_linear_expression_copy():
+    x = IntegerVariable(name="x", index=0)
+    le = LinearExpression()
+    le.add_variable(x, 2)
+
+    le_copy = copy(le)
+    le_copy.add_variable(x, -2)
+    assert dict(le_copy.variables) == {}
+    assert dict(le.variables) == {x: 2}
@@ -0,0 +1,49 @@
+import numpy as np
+
+from dronedelivery.utils.mip_utils.constraint_matrix import (
+    ConstraintMatrixBuilder,
+    EQUAL,
+    LESS_OR_EQUAL,
+)
+from dronedelivery.utils.mip_utils.mip_solver import MipSolver
+from dronedelivery.utils.mip_utils.model import Model
+from dronedelivery.utils.mip_utils.variables import IntegerVariable
+
+
+def get_sparse_model():
+    # min x + 2y s.t. x + y = 3, x <= 1
+    x = IntegerVariable(name="x", lower_bound=0, index=0)
+    y = IntegerVariable(name="y", lower_bound=0, upper_bound=5, index=1)
+
+    constraints = ConstraintMatrixBuilder(max_nonzeros=3)
+    row = constraints.add_constraint(EQUAL, 3)
+    constraints.add_coefficient(row, x)
+    constraints.add_coefficient(row, y)
+    row = constraints.add_constraint(LESS_OR_EQUAL, 1)
+    constraints.add_coefficient(row, x)
+
+    return Model.from_sparse(
+        decision_variables=[x, y],
+        objective=np.array([1.0, 2.0]),
+        constraint_matrix=constraints.get_matrix(n_variables=2),
+        sense=constraints.get_sense(),
+        rhs=constraints.get_rhs(),
+    )
+
+
+def test_to_mps_bytes():
+    mps = get_sparse_model().to_mps_bytes().decode().splitlines()
+
+    assert mps[0].startswith("NAME")
+    assert mps[-1] == "ENDATA"
+    assert " E r0" in mps and " L r1" in mps
+    assert " x1 obj 2.0" in mps
+    assert " UP bnd x1 5" in mps and " PL bnd x0" in mps
+
+
+def test_mip_solver_sparse_model():
+    model = get_sparse_model()
+    x, y = model.decision_variables
+
+    solution = MipSolver(model).solve(max_seconds=10)
+    assert solution == {x: 1, y: 2}
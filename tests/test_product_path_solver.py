@@ -1,5 +1,13 @@
-from dronedelivery.solve_product_path.solve_product_path import SolveProductTrips
+import pytest
+
+from dronedelivery.solve_product_path.solve_product_path import (
+    SolveProductTrips,
+    FlightsCustomerHub,
+    ProductsMoveCustomerHub,
+)
 from dronedelivery.utils.mip_utils.mip_solver import MipSolver
+from dronedelivery.utils.mip_utils.highs_solver import HighsSolver
+from dronedelivery.utils.mip_utils.cp_sat_solver import CpSatSolver
 from statistics import mean
 
 from tests.fixtures import full_problem
@@ -40,3 +48,81 @@ def test_product_path_solver_integration(full_problem):
     for customer, demanded_products in customer_demand.items():
         for product, still_need_to_be_delivered in demanded_products.items():
             assert still_need_to_be_delivered == 0
+
+
+def test_product_path_solver_only_moves_demanded_products(full_problem):
+    customers = full_problem.get_customers()[:20]
+    products = full_problem.products[:20]
+    hubs = full_problem.warehouses[:10]
+
+    solve_product_trips = SolveProductTrips(
+        customers=customers,
+        hubs=hubs,
+        products=products,
+        max_flight_capacity=100,
+        environment=full_problem.get_environment(),
+    )
+
+    for variable in solve_product_trips.decision_variables:
+        if isinstance(variable, ProductsMoveCustomerHub):
+            assert variable.data["product"] in variable.data["customer"].demand
+
+
+@pytest.mark.parametrize("Mip_Solver", [MipSolver, HighsSolver, CpSatSolver])
+def test_product_path_solver_delivers_demand(full_problem, Mip_Solver):
+    solve_product_trips = _get_small_solve_product_trips(full_problem)
+
+    product_trips = solve_product_trips.solve(Mip_Solver=Mip_Solver, max_seconds=5)
+
+    _assert_demand_is_delivered(solve_product_trips, product_trips)
+
+
+def test_product_path_solver_column_generation(full_problem):
+    solve_product_trips = _get_small_solve_product_trips(full_problem)
+    full_objective = _get_relaxation_objective(solve_product_trips.model)
+
+    product_trips = solve_product_trips.solve_cg(
+        Mip_Solver=MipSolver, max_iters=5, max_seconds=10
+    )
+
+    _assert_demand_is_delivered(solve_product_trips, product_trips)
+    # pricing added arcs to the nearest hub of every customer until the relaxation of
+    # the restricted model reached the relaxation optimum of the full model
+    n_customer_hub_arcs = sum(
+        isinstance(variable, FlightsCustomerHub)
+        for variable in solve_product_trips.model.decision_variables
+    )
+    assert n_customer_hub_arcs > len(solve_product_trips.customers)
+    assert _get_relaxation_objective(solve_product_trips.model) == pytest.approx(
+        full_objective
+    )
+
+
+def _get_small_solve_product_trips(full_problem):
+    return SolveProductTrips(
+        customers=full_problem.get_customers()[:5],
+        hubs=full_problem.warehouses[:10],
+        products=full_problem.products[:20],
+        max_flight_capacity=100,
+        environment=full_problem.get_environment(),
+    )
+
+
+def _get_relaxation_objective(model):
+    mip_solver = MipSolver(model=model)
+    mip_solver.solve_relaxation()
+    return mip_solver.m.objective_value
+
+
+def _assert_demand_is_delivered(solve_product_trips, product_trips):
+    delivered = {}
+    for trip in product_trips["hub_to_customer"]:
+        key = (trip.destination, trip.product_type)
+        delivered[key] = delivered.get(key, 0) + trip.product_quantity
+
+    assert delivered == {
+        (customer, product): customer.demand[product]
+        for customer in solve_product_trips.customers
+        for product in solve_product_trips.products
+        if product in customer.demand
+    }